@@ -1,6 +1,7 @@
 import pandas as pd
 import streamlit as st
 
+from assessment_client.modules.config import EXCEL_ENGINE_OPTIONS
 from assessment_client.pages.assessment_report import render as render_assessment_report
 from assessment_client.pages.matrix_competencies import render as render_matrix_competencies
 from assessment_client.pages.create_assessment import render as render_create_assessment
@@ -26,15 +27,23 @@ EXTERNAL_LOGIC_EXAMPLE_PATH = "src/assessment_client/examples/external/logic.xls
 EXTERNAL_MATRIX_EXAMPLE_PATH = "src/assessment_client/examples/external/matrix.xlsx"
 
 
+@st.cache_resource
 def load_example_metadata():
     """Загружает метаданные из примеров Excel-файлов."""
-    answers_df = pd.read_excel(IPR_ANSWERS_EXAMPLE_PATH, sheet_name="Результаты участников")
-    logic_df = pd.read_excel(IPR_LOGIC_EXAMPLE_PATH)
-    matrix_df = pd.read_excel(IPR_MATRIX_EXAMPLE_PATH)
+    # Only headers and the chapter column are needed, not the data rows
+    with pd.ExcelFile(IPR_ANSWERS_EXAMPLE_PATH, **EXCEL_ENGINE_OPTIONS) as answers_file:
+        answers_columns = answers_file.parse("Результаты участников", nrows=0).columns.tolist()
+        question_types = (
+            answers_file.parse("Результаты участников", usecols=["Название главы"])["Название главы"]
+            .drop_duplicates()
+            .tolist()
+        )
+    logic_df = pd.read_excel(IPR_LOGIC_EXAMPLE_PATH, nrows=0, **EXCEL_ENGINE_OPTIONS)
+    matrix_df = pd.read_excel(IPR_MATRIX_EXAMPLE_PATH, nrows=0, **EXCEL_ENGINE_OPTIONS)
 
     return {
-        "question_types": answers_df["Название главы"].unique().tolist(),
-        "answers_columns": answers_df.columns.tolist(),
+        "question_types": question_types,
+        "answers_columns": answers_columns,
         "logic_columns": logic_df.columns.tolist(),
         "matrix_columns": matrix_df.columns.tolist()
     }
@@ -1,4 +1,78 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of payloads sent to the API concurrently
+MAX_PARALLEL_REQUESTS = 8
+
+# POSTs create evaluations and are not idempotent, so a request is only re-sent
+# when the backend cannot have processed it: connection errors (never delivered)
+# and 429/503 (rejected up front, Retry-After is honoured). Read timeouts,
+# dropped connections and gateway errors are returned to the caller as-is
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    other=0,
+    backoff_factor=0.3,
+    # 502/504 are left out: the proxy may already have handed the request to the backend
+    status_forcelist=[429, 503],
+    allowed_methods=["POST"],
+    raise_on_status=False,
+)
+
+# Shared session keeps connections to the API alive between payloads
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=MAX_PARALLEL_REQUESTS,
+    pool_maxsize=MAX_PARALLEL_REQUESTS,
+    max_retries=_RETRY,
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+def serialize_payload(payload) -> bytes:
+    """Serialize a payload to JSON bytes with orjson."""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def serialize_payloads(payloads, shared_key="competency_matrix"):
+    """
+    Serialize many payloads that embed the same ``shared_key`` value.
+
+    The shared value is encoded once per distinct object and spliced into
+    every body at its original key position, instead of being re-encoded for
+    each payload. Each body is byte-identical to ``serialize_payload(payload)``.
+
+    Args:
+        payloads: Mapping of key -> payload dict
+        shared_key: Payload field holding the shared value
+
+    Returns:
+        Mapping of key -> JSON bytes
+    """
+    encoded_shared = {}
+    bodies = {}
+    for key, payload in payloads.items():
+        if shared_key not in payload:
+            bodies[key] = serialize_payload(payload)
+            continue
+
+        shared_value = payload[shared_key]
+        if id(shared_value) not in encoded_shared:
+            encoded_shared[id(shared_value)] = serialize_payload(shared_value)
+
+        # Encode the fields before and after the shared key separately and
+        # join their inner parts around the pre-encoded value
+        keys = list(payload)
+        position = keys.index(shared_key)
+        head = serialize_payload({k: payload[k] for k in keys[:position]})[1:-1]
+        tail = serialize_payload({k: payload[k] for k in keys[position + 1:]})[1:-1]
+        shared_field = serialize_payload(shared_key) + b":" + encoded_shared[id(shared_value)]
+        bodies[key] = b"{" + b",".join(part for part in (head, shared_field, tail) if part) + b"}"
+    return bodies
 
 
 def send_to_assessment_api(payload, api_url):
@@ -6,16 +80,17 @@ def send_to_assessment_api(payload, api_url):
     Send JSON payload to the assessment API.
 
     Args:
-        email: Email address
-        payload: JSON payload to send
+        payload: JSON payload to send (dict, or bytes already serialized
+            with ``serialize_payload``)
         api_url: API endpoint URL
 
     Returns:
         Response object or error message
     """
     # try:
+    body = payload if isinstance(payload, bytes) else serialize_payload(payload)
     headers = {'Content-Type': 'application/json'}
-    response = requests.post(api_url, json=payload, headers=headers, timeout=120)
+    response = _SESSION.post(api_url, data=body, headers=headers, timeout=120)
     return response
     # except Exception as e:
     #     return str(e)
@@ -1,8 +1,29 @@
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE_OPTIONS = {"engine": "calamine"}
+except ImportError:
+    # Streaming row iterator instead of the full in-memory workbook DOM
+    EXCEL_ENGINE_OPTIONS = {
+        "engine": "openpyxl",
+        "engine_kwargs": {"read_only": True, "data_only": True, "keep_links": False},
+    }
+
 REQUIRED_COMPETENCY_COLUMNS = [
     "competency", "competency_description", "weight",
     "indicator_name", "indicator_description",
     "level_0", "level_1", "level_2", "level_3",
 ]
+# Read as strings so numeric-looking cells don't turn into floats on the way to the API
+COMPETENCY_TEXT_COLUMNS = [
+    "competency", "competency_description",
+    "indicator_name", "indicator_description",
+    "level_0", "level_1", "level_2", "level_3",
+]
+ANSWERS_COLUMNS = (
+    "ФИО", "Email", "Название главы", "Название задания", "Дата отправки", "Ответ участника",
+)
+ANSWERS_TEXT_COLUMNS = tuple(col for col in ANSWERS_COLUMNS if col != "Дата отправки")
+TASKS_COLUMNS = ("Название задания", "Вопрос", "Тип оценки", "Компетенции", "Индикаторы")
 REQUIRED_QA_COLUMNS = ["Email", "Name", "Позиция", "Вопрос", "Ответ участника", "Компетенции"]
 EVAL_TYPE_KEYS = ["external", "development"]
 
@@ -132,6 +132,8 @@ class CreateAssessmentRequest(BaseModel):
 
 
 class Statement(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     question: str = Field(
         ..., description="Statement or question text shown to the participant"
     )
@@ -144,6 +146,8 @@ class Statement(BaseModel):
 
 
 class Dilemma(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     dilemma: str = Field(
         ..., description="Dilemma question text shown to the participant"
     )
@@ -159,6 +163,8 @@ class Dilemma(BaseModel):
 
 
 class MiniCase(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     mini_case: str = Field(..., description="Текст мини-кейса с описанием ситуации")
     competencies: List[str] = Field(
         ..., description="Список компетенций, которые оценивает мини-кейс"
@@ -170,6 +176,8 @@ class MiniCase(BaseModel):
 
 
 class BigCase(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     big_case: str = Field(
         ..., description="Текст большого кейса с описанием комплексной ситуации"
     )
@@ -184,6 +192,8 @@ class BigCase(BaseModel):
 
 class OpenAssessmentQuestion(BaseModel):
     """Open question for assessment evaluation"""
+    model_config = ConfigDict(frozen=True)
+
     question: str = Field(..., description="Assessment question")
     answer: str = Field(..., description="Assessment answer")
     competencies: List[str] = Field(..., description="Associated competencies")
@@ -1,13 +1,49 @@
-import tempfile
-from pathlib import Path
+import asyncio
+import io
+import sys
 from typing import Dict, List
 
 import pandas as pd
 import numpy as np
+import streamlit as st
+
+from assessment_client.modules.config import (
+    ANSWERS_COLUMNS,
+    EXCEL_ENGINE_OPTIONS,
+    ANSWERS_TEXT_COLUMNS,
+    COMPETENCY_TEXT_COLUMNS,
+    REQUIRED_COMPETENCY_COLUMNS,
+    TASKS_COLUMNS,
+)
+from assessment_client.modules.data_models import Competency, EvalAssessmentRequest
+from assessment_client.modules.validation import (
+    clean_text_series,
+    drop_rows_with_nan,
+    normalize_spaces_series,
+    validate_competency_data,
+)
+
+@st.cache_data(max_entries=8, ttl=3600, show_spinner=False)
+def _read_excel(data: bytes, columns: tuple, text_columns: tuple = (), sheet_name=0) -> pd.DataFrame:
+    """
+    Read only ``columns`` from the raw bytes of an uploaded Excel file.
+
+    Pass ``UploadedFile.getvalue()``: it shares Streamlit's in-memory upload
+    buffer (and so does ``io.BytesIO`` below), so no extra copy is made.
+
+    Uses the Rust-based calamine engine when ``python-calamine`` is installed
+    and falls back to openpyxl in read-only mode otherwise. Results are cached
+    by file content, so Streamlit reruns don't re-parse unchanged uploads.
 
-from assessment_client.modules.config import REQUIRED_COMPETENCY_COLUMNS
-from assessment_client.modules.data_models import EvalAssessmentRequest
-from assessment_client.modules.validation import drop_rows_with_nan, normalize_spaces, clean_text, validate_competency_data
+    Columns that are absent from the sheet are silently skipped so that the
+    callers can report missing columns with their own error messages.
+    """
+    with pd.ExcelFile(io.BytesIO(data), **EXCEL_ENGINE_OPTIONS) as workbook:
+        return workbook.parse(
+            sheet_name,
+            usecols=lambda col: col in columns,
+            dtype={col: "string" for col in text_columns},
+        )
 
 
 def safe_value(value, default=None):
@@ -32,6 +68,19 @@ def safe_value(value, default=None):
     return value
 
 
+def _split_tokens(series: pd.Series, sep: str) -> pd.Series:
+    """
+    Split a text column into lists of stripped, non-empty tokens.
+
+    The split runs once over the whole column with pandas' ``.str.split``;
+    missing values become empty lists. Tokens are interned, since the same
+    competency and indicator names repeat across many tasks.
+    """
+    return series.fillna("").str.split(sep, regex=False).map(
+        lambda parts: [sys.intern(token) for token in map(str.strip, parts) if token]
+    )
+
+
 def process_competency_file(competency_file):
     """
     Process a competency matrix Excel file and return a list of Competency dicts.
@@ -49,12 +98,7 @@ def process_competency_file(competency_file):
         List[dict] – one dict per unique competency, matching the
         ``Competency`` Pydantic model on the server.
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        competency_path = Path(temp_dir) / competency_file.name
-        with open(competency_path, 'wb') as f:
-            f.write(competency_file.getbuffer())
-
-        df_competency = pd.read_excel(competency_path)
+    df_competency = _read_competency_df(competency_file)
 
     # Forward-fill competency-level columns so grouped indicator rows
     # don't get dropped when competency/description/weight are only in the first row
@@ -67,32 +111,33 @@ def process_competency_file(competency_file):
         df_competency, REQUIRED_COMPETENCY_COLUMNS, "Матрица компетенций"
     )
 
-    # Normalise key text columns
-    df_competency["competency"] = (
-        df_competency["competency"].fillna("").astype(str).map(normalize_spaces)
-    )
-    df_competency["competency_description"] = (
-        df_competency["competency_description"].fillna("").astype(str).map(normalize_spaces)
-    )
+    # Normalise key text columns (read as strings, NaN rows already dropped)
+    for col in ["competency", "competency_description", "indicator_name", "indicator_description"]:
+        df_competency[col] = normalize_spaces_series(df_competency[col])
+
+    # Unparseable weights fall back to the default of 50
+    df_competency["weight"] = pd.to_numeric(df_competency["weight"], errors="coerce").fillna(50.0)
 
     level_columns = ["level_0", "level_1", "level_2", "level_3"]
+    for lvl in level_columns:
+        df_competency[lvl] = df_competency[lvl].str.strip()
 
     # Group rows by competency name to build nested structure
     competency_matrix = []
     seen_competencies: dict = {}  # name -> index in competency_matrix
 
-    for _, row in df_competency.iterrows():
-        comp_name = row["competency"]
+    rows = df_competency[REQUIRED_COMPETENCY_COLUMNS].itertuples(index=False, name=None)
+    for comp_name, comp_description, weight_val, ind_name, ind_description, *levels in rows:
         if not comp_name:
             continue
 
         # Build indicator entry with levels as list of {level, description}
         indicator = {
-            "name": normalize_spaces(str(row.get("indicator_name", ""))),
-            "description": normalize_spaces(str(row.get("indicator_description", ""))),
+            "name": ind_name,
+            "description": ind_description,
             "levels": [
-                {"level": idx, "description": str(row[lvl]).strip() if pd.notna(row.get(lvl)) else ""}
-                for idx, lvl in enumerate(level_columns)
+                {"level": idx, "description": level}
+                for idx, level in enumerate(levels)
             ],
         }
 
@@ -100,16 +145,10 @@ def process_competency_file(competency_file):
             idx = seen_competencies[comp_name]
             competency_matrix[idx]["indicators"].append(indicator)
         else:
-            weight_val = row.get("weight", 50.0)
-            try:
-                weight_val = float(weight_val)
-            except (ValueError, TypeError):
-                weight_val = 50.0
-
             competency = {
                 "competency": comp_name,
-                "competency_description": row["competency_description"],
-                "weight": weight_val,
+                "competency_description": comp_description,
+                "weight": float(weight_val),
                 "indicators": [indicator],
             }
             seen_competencies[comp_name] = len(competency_matrix)
@@ -120,54 +159,51 @@ def process_competency_file(competency_file):
 
 def _read_competency_df(competency_file) -> pd.DataFrame:
     """Read the competency Excel file into a DataFrame (reusable helper)."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        competency_path = Path(temp_dir) / competency_file.name
-        competency_file.seek(0)
-        with open(competency_path, 'wb') as f:
-            f.write(competency_file.getbuffer())
-        return pd.read_excel(competency_path)
+    return _read_excel(
+        competency_file.getvalue(),
+        tuple(REQUIRED_COMPETENCY_COLUMNS),
+        tuple(COMPETENCY_TEXT_COLUMNS),
+    )
 
 
 async def df_from_files(participants_results_file, tasks_file):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        participants_path = Path(temp_dir) / participants_results_file.name
-        with open(participants_path, 'wb') as f:
-            f.write(participants_results_file.getbuffer())
-
-        df1 = pd.read_excel(participants_path, sheet_name="Результаты участников")
-
-        tasks_path = Path(temp_dir) / tasks_file.name
-        with open(tasks_path, 'wb') as f:
-            f.write(tasks_file.getbuffer())
-
-        df2 = pd.read_excel(tasks_path)
-
-    cols_answers = [
-        'ФИО',
-        'Email',
-        'Название главы',
-        'Название задания',
-        'Дата отправки',
-        'Ответ участника',
-    ]
-    df_answers_filtered = df1[cols_answers]
-
-    cols_tasks = [
-        'Название задания',
-        'Вопрос',
-        'Тип оценки',
-        'Компетенции',
-        'Индикаторы',
-    ]
+    # Parse both workbooks concurrently, off the event loop
+    df1, df2 = await asyncio.gather(
+        asyncio.to_thread(
+            _read_excel,
+            participants_results_file.getvalue(),
+            ANSWERS_COLUMNS,
+            ANSWERS_TEXT_COLUMNS,
+            sheet_name="Результаты участников",
+        ),
+        asyncio.to_thread(_read_excel, tasks_file.getvalue(), TASKS_COLUMNS, TASKS_COLUMNS),
+    )
 
-    missing_task_cols = [col for col in cols_tasks if col not in df2.columns]
+    df_answers_filtered = df1[list(ANSWERS_COLUMNS)]
+
+    # Re-submitted answers would only be collapsed later, per question; drop
+    # them up front (keeping the first, as the question aggregation does)
+    duplicated = df_answers_filtered.duplicated(subset=["Email", "Название задания"], keep="first")
+    if duplicated.any():
+        st.warning(
+            f"Результаты участников: удалено повторяющихся ответов — {int(duplicated.sum())} "
+            "(совпадают Email и «Название задания»)"
+        )
+        df_answers_filtered = df_answers_filtered[~duplicated]
+
+    missing_task_cols = [col for col in TASKS_COLUMNS if col not in df2.columns]
     if missing_task_cols:
         raise ValueError(
             "The tasks Excel file is missing required column(s): "
             + ", ".join(missing_task_cols)
         )
-    df_tasks_filtered = df2[cols_tasks].copy()
+    df_tasks_filtered = df2[list(TASKS_COLUMNS)].copy()
     df_tasks_filtered.dropna(subset=["Название задания"], inplace=True)
+    # Fill empty text cells column-wise so the row loops can use values as-is
+    df_tasks_filtered[["Вопрос", "Тип оценки"]] = df_tasks_filtered[["Вопрос", "Тип оценки"]].fillna("")
+    # Tokenize once per task rather than once per participant answer
+    df_tasks_filtered["_competencies"] = _split_tokens(df_tasks_filtered["Компетенции"], ",")
+    df_tasks_filtered["_indicators"] = _split_tokens(df_tasks_filtered["Индикаторы"], ";\n")
 
     merged_df = pd.merge(df_answers_filtered, df_tasks_filtered, on="Название задания", how="inner")
     if merged_df.empty:
@@ -180,7 +216,7 @@ async def df_from_files(participants_results_file, tasks_file):
     return merged_df
 
 
-async def process_statement_inputs(df_statements_one_email) -> List[Dict]:
+def process_statement_inputs(df_statements_one_email) -> List[Dict]:
     """
     Process statements for a single email.
     
@@ -193,16 +229,12 @@ async def process_statement_inputs(df_statements_one_email) -> List[Dict]:
     results: List[Dict] = []
     seen_questions: dict = {}  # question -> index in results
 
-    for _, row in df_statements_one_email.iterrows():
-        question = safe_value(row["Вопрос"], "")
-        answer = safe_value(row["Ответ участника"], "")
-        eval_type = safe_value(row["Тип оценки"], "")
-
-        comp_val = safe_value(row["Компетенции"], "")
-        new_comps = [c.strip() for c in str(comp_val).split(',') if c.strip()] if comp_val else []
-
-        ind_val = safe_value(row.get("Индикаторы", ""), "")
-        new_inds = [i.strip() for i in str(ind_val).split(';\n') if i.strip()] if ind_val else []
+    columns = ["Вопрос", "Ответ участника", "Тип оценки", "_competencies", "_indicators"]
+    rows = df_statements_one_email[columns].itertuples(index=False, name=None)
+    for question, answer, eval_type, comps, inds in rows:
+        # Copy: the token lists are shared by every participant answering this task
+        new_comps = list(comps)
+        new_inds = list(inds)
 
         if question in seen_questions:
             idx = seen_questions[question]
@@ -214,13 +246,13 @@ async def process_statement_inputs(df_statements_one_email) -> List[Dict]:
                     results[idx]["indicators"].append(i)
         else:
             seen_questions[question] = len(results)
-            results.append(dict(
-                question=question,
-                eval_type=eval_type,
-                competencies=new_comps,
-                indicators=new_inds,
-                answer=answer,
-            ))
+            results.append({
+                "question": question,
+                "eval_type": eval_type,
+                "competencies": new_comps,
+                "indicators": new_inds,
+                "answer": answer,
+            })
     return results
 
 def _aggregate_by_question(df: pd.DataFrame) -> List[tuple]:
@@ -237,15 +269,11 @@ def _aggregate_by_question(df: pd.DataFrame) -> List[tuple]:
     results: List[tuple] = []
     seen_questions: dict = {}  # question -> index in results
 
-    for _, row in df.iterrows():
-        question = safe_value(row["Вопрос"], "")
-        answer = safe_value(row["Ответ участника"], "")
-
-        comp_val = safe_value(row["Компетенции"], "")
-        new_comps = [c.strip() for c in str(comp_val).split(',') if c.strip()] if comp_val else []
-
-        ind_val = safe_value(row["Индикаторы"], "")
-        new_inds = [i.strip() for i in str(ind_val).split(';\n') if i.strip()] if ind_val else []
+    columns = ["Вопрос", "Ответ участника", "_competencies", "_indicators"]
+    for question, answer, comps, inds in df[columns].itertuples(index=False, name=None):
+        # Copy: the token lists are shared by every participant answering this task
+        new_comps = list(comps)
+        new_inds = list(inds)
 
         if question in seen_questions:
             idx = seen_questions[question]
@@ -264,7 +292,7 @@ def _aggregate_by_question(df: pd.DataFrame) -> List[tuple]:
     return results
 
 
-async def process_mini_case_inputs(df_mini_cases_one_email) -> List[Dict]:
+def process_mini_case_inputs(df_mini_cases_one_email) -> List[Dict]:
     """
     Process mini cases for a single email.
     Args:
@@ -273,11 +301,11 @@ async def process_mini_case_inputs(df_mini_cases_one_email) -> List[Dict]:
         List of dicts matching MiniCase contract
     """
     return [
-        dict(mini_case=q, competencies=comps, indicators=inds, answer=ans)
+        {"mini_case": q, "competencies": comps, "indicators": inds, "answer": ans}
         for q, ans, comps, inds in _aggregate_by_question(df_mini_cases_one_email)
     ]
 
-async def process_big_case_inputs(df_big_cases_one_email) -> List[Dict]:
+def process_big_case_inputs(df_big_cases_one_email) -> List[Dict]:
     """
     Process big cases for a single email.
     Args:
@@ -286,11 +314,11 @@ async def process_big_case_inputs(df_big_cases_one_email) -> List[Dict]:
         List of dicts matching BigCase contract
     """
     return [
-        dict(big_case=q, competencies=comps, indicators=inds, answer=ans)
+        {"big_case": q, "competencies": comps, "indicators": inds, "answer": ans}
         for q, ans, comps, inds in _aggregate_by_question(df_big_cases_one_email)
     ]
 
-async def process_dilemma_inputs(df_dilemma_one_email) -> List[Dict]:
+def process_dilemma_inputs(df_dilemma_one_email) -> List[Dict]:
     """
     Process dilemmas for a single email.
     
@@ -301,11 +329,11 @@ async def process_dilemma_inputs(df_dilemma_one_email) -> List[Dict]:
         List of dicts matching DilemmasData contract
     """
     return [
-        dict(dilemma=q, competencies=comps, indicators=inds, answer=ans)
+        {"dilemma": q, "competencies": comps, "indicators": inds, "answer": ans}
         for q, ans, comps, inds in _aggregate_by_question(df_dilemma_one_email)
     ]
 
-async def process_open_question_inputs(df_open_one_email) -> List[Dict]:
+def process_open_question_inputs(df_open_one_email) -> List[Dict]:
     """
     Process open questions for a single email.
     Args:
@@ -314,10 +342,22 @@ async def process_open_question_inputs(df_open_one_email) -> List[Dict]:
         List of dicts matching OpenQuestionsData contract
     """
     return [
-        dict(question=q, answer=ans, competencies=comps, indicators=inds)
+        {"question": q, "answer": ans, "competencies": comps, "indicators": inds}
         for q, ans, comps, inds in _aggregate_by_question(df_open_one_email)
     ]
 
+# Chapter name -> (EvalAssessmentRequest field, processor)
+CHAPTER_PROCESSORS = (
+    ("Быстрая самооценка", "statements", process_statement_inputs),
+    ("Дилеммы", "dilemmas", process_dilemma_inputs),
+    ("Открытые вопросы", "open_questions", process_open_question_inputs),
+    ("Мини кейсы", "mini_cases", process_mini_case_inputs),
+    ("Большие кейсы", "big_cases", process_big_case_inputs),
+)
+
+# Where the shared matrix dump goes back in, so payloads keep the schema's key order
+MATRIX_FIELD_POSITION = list(EvalAssessmentRequest.model_fields).index("competency_matrix")
+
 async def process_all_inputs(participants_results_file, tasks_file, competency_file=None, assessment_info="", assessment_type="external", report_parts=None, show_average_scores=True, show_qualification=True) -> Dict[str, Dict]:
     """
     Process uploaded files and return CombinedAssessmentRequest payloads per email.
@@ -331,39 +371,59 @@ async def process_all_inputs(participants_results_file, tasks_file, competency_f
     Returns:
         Dict mapping email -> CombinedAssessmentRequest payload
     """
-    # Merge dataframes from uploaded files
-    df_merged = await df_from_files(participants_results_file, tasks_file)
+    # Merge dataframes from uploaded files. The matrix workbook is parsed
+    # alongside them; the cached reader serves the later matrix reads
+    if competency_file is not None:
+        df_merged, _ = await asyncio.gather(
+            df_from_files(participants_results_file, tasks_file),
+            asyncio.to_thread(_read_competency_df, competency_file),
+        )
+    else:
+        df_merged = await df_from_files(participants_results_file, tasks_file)
     
     # Process and validate competency file
     competency_matrix = None
+    shared_matrix_dump = None
     if competency_file is not None:
-        competency_matrix = process_competency_file(competency_file)
+        # Validate and dump the matrix once; every payload shares the same list
+        competency_matrix = [
+            Competency.model_validate(competency)
+            for competency in process_competency_file(competency_file)
+        ]
+        shared_matrix_dump = [
+            competency.model_dump(by_alias=True) for competency in competency_matrix
+        ]
 
         # Cross-validate competency names between matrix and answers
         df_competency_raw = _read_competency_df(competency_file)
         validate_competency_data(df_competency_raw, df_merged)
     
-    # Split by email at the top level
-    emails = df_merged["Email"].unique()
+    # Normalise chapter names and answers once for the whole sheet
+    df_merged["Название главы"] = normalize_spaces_series(df_merged["Название главы"])
+    df_merged["Ответ участника"] = clean_text_series(df_merged["Ответ участника"])
+
+    # Split by email and chapter in a single pass; categorical codes make
+    # the groupby hash ints instead of one email string per row
+    df_merged["Email"] = df_merged["Email"].astype("category")
+    # Make each participant's rows contiguous (stable, in first-appearance
+    # order) so every group slice is a sequential read
+    email_order, _ = pd.factorize(df_merged["Email"])
+    if not (np.diff(email_order) >= 0).all():
+        df_merged = df_merged.iloc[np.argsort(email_order, kind="stable")]
+
+    chapters_by_email: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for (email, chapter), df_chapter in df_merged.groupby(
+        ["Email", "Название главы"], sort=False, observed=True
+    ):
+        chapters_by_email.setdefault(str(email), {})[chapter] = df_chapter
+
     all_payloads = {}
     
-    for email in emails:
-        # Filter data for this specific email
-        df_one_email = df_merged[df_merged["Email"] == email]
-        
-        # Get user info from first row
-        first_row = df_one_email.iloc[0]
+    for email, chapters in chapters_by_email.items():
+        # Get user info from first row (groups come in first-appearance order)
+        first_row = next(iter(chapters.values())).iloc[0]
         user_name = safe_value(first_row.get("ФИО"), email)
         position_title = safe_value(first_row.get("Позиция"), "")
-        df_one_email["Название главы"] = df_one_email["Название главы"].fillna('').astype(str).map(normalize_spaces)
-        df_one_email["Ответ участника"] = df_one_email["Ответ участника"].fillna('').astype(str).map(clean_text)
-        
-        # Prepare filtered dataframes for each task type
-        df_statements = df_one_email[df_one_email['Название главы'] == 'Быстрая самооценка']
-        df_open_questions = df_one_email[df_one_email['Название главы'] == 'Открытые вопросы']
-        df_dilemmas = df_one_email[df_one_email['Название главы'] == 'Дилеммы']
-        df_mini_cases = df_one_email[df_one_email['Название главы'] == 'Мини кейсы']
-        df_big_cases = df_one_email[df_one_email['Название главы'] == 'Большие кейсы']
 
         # Build CombinedAssessmentRequest structure
 
@@ -386,28 +446,19 @@ async def process_all_inputs(participants_results_file, tasks_file, competency_f
             "show_qualification": show_qualification,
         }
         
-        # Process each task type
-        if not df_statements.empty:
-            statements_data = await process_statement_inputs(df_statements)
-            combined_request["statements"] = statements_data
-        
-        if not df_dilemmas.empty:
-            dilemmas_data = await process_dilemma_inputs(df_dilemmas)
-            combined_request["dilemmas"] = dilemmas_data
-
-        if not df_open_questions.empty:
-            open_data = await process_open_question_inputs(df_open_questions)
-            combined_request["open_questions"] = open_data
-
-        if not df_mini_cases.empty:
-            mini_cases_data = await process_mini_case_inputs(df_mini_cases)
-            combined_request["mini_cases"] = mini_cases_data
-        
-        if not df_big_cases.empty:
-            big_cases_data = await process_big_case_inputs(df_big_cases)
-            combined_request["big_cases"] = big_cases_data
+        # Process each task type present for this participant (groups are never empty)
+        for chapter, request_key, processor in CHAPTER_PROCESSORS:
+            df_chapter = chapters.get(chapter)
+            if df_chapter is not None:
+                combined_request[request_key] = processor(df_chapter)
         
+        # Already-validated Competency instances are not re-validated here
         validated = EvalAssessmentRequest(**combined_request)
-        all_payloads[email] = validated.model_dump(by_alias=True)
+        payload_items = list(
+            validated.model_dump(by_alias=True, exclude={"competency_matrix"}).items()
+        )
+        payload_items.insert(MATRIX_FIELD_POSITION, ("competency_matrix", shared_matrix_dump))
+        payload = dict(payload_items)
+        all_payloads[email] = payload
     
     return all_payloads
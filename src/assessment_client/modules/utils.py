@@ -1,7 +1,13 @@
-
 from pathlib import Path
 import streamlit as st
 
+
+@st.cache_resource
+def _load_example(path: str) -> bytes:
+    """Read an example file once and keep its bytes in memory across reruns."""
+    return Path(path).read_bytes()
+
+
 def download_example_button(
         path: str, 
         file_name: str = "statements_example.xlsx",
@@ -9,10 +15,9 @@ def download_example_button(
     ):
     example_file_path = Path(path)
     if example_file_path.exists():
-        with open(example_file_path, "rb") as f:
-            st.download_button(
-                label=label,
-                data=f,
-                file_name=file_name,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        st.download_button(
+            label=label,
+            data=_load_example(str(example_file_path)),
+            file_name=file_name,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
@@ -2,19 +2,35 @@ import pandas as pd
 import streamlit as st
 import re
 
+_WS_RE = re.compile(r'\s+')
+_PAREN_RE = re.compile(r'[()]')
+_NAME_FORBIDDEN_RE = re.compile(r'[(),]')
+
 
 def clean_text(text: str) -> str:
     if text is None:
         return ''
     # Remove leading/trailing whitespace and replace multiple spaces with a single space
-    cleaned = re.sub(r'\s+', ' ', str(text)).strip()
+    cleaned = _WS_RE.sub(' ', text if type(text) is str else str(text)).strip()
     cleaned = cleaned.replace('_x000D_', '')
     return cleaned
 
 def normalize_spaces(text: str) -> str:
     if text is None:
         return ''
-    return re.sub(r'\s+', ' ', str(text)).strip()
+    return _WS_RE.sub(' ', text if type(text) is str else str(text)).strip()
+
+
+def clean_text_series(series: pd.Series) -> pd.Series:
+    """Column-wise ``clean_text``; missing values become ''."""
+    return (
+        normalize_spaces_series(series)
+        .str.replace('_x000D_', '', regex=False)
+    )
+
+def normalize_spaces_series(series: pd.Series) -> pd.Series:
+    """Column-wise ``normalize_spaces``; missing values become ''."""
+    return series.fillna('').astype(str).str.replace(_WS_RE, ' ', regex=True).str.strip()
 
 
 def drop_rows_with_nan(df: pd.DataFrame, required_cols, dataset_name: str) -> pd.DataFrame:
@@ -22,23 +38,24 @@ def drop_rows_with_nan(df: pd.DataFrame, required_cols, dataset_name: str) -> pd
     if missing_columns:
         raise ValueError(f"{dataset_name}: отсутствуют обязательные колонки: {', '.join(missing_columns)}")
 
-    rows_to_drop = []
-    for idx, row in df.iterrows():
-        nan_columns = [col for col in required_cols if pd.isna(row[col])]
-        if nan_columns:
-            rows_to_drop.append((idx, nan_columns))
+    # One vectorized NaN scan; only offending rows are visited in Python
+    nan_mask = df[list(required_cols)].isna()
+    bad_row_mask = nan_mask.any(axis=1)
+    bad_rows = nan_mask[bad_row_mask]
 
-    if not rows_to_drop:
+    if bad_rows.empty:
         return df
 
-    for idx, nan_columns in rows_to_drop:
+    for idx, row_mask in zip(bad_rows.index, bad_rows.to_numpy()):
+        nan_columns = [col for col, is_nan in zip(bad_rows.columns, row_mask) if is_nan]
         excel_row_number = idx + 2  # +2 to account for header row in Excel export
         st.warning(
             f"{dataset_name}: строка {excel_row_number} удалена из-за NaN в колонках: "
             + ", ".join(nan_columns)
         )
 
-    cleaned_df = df.drop(index=[idx for idx, _ in rows_to_drop]).reset_index(drop=True)
+    # Boolean selection skips the label lookup (Index.difference) done by drop
+    cleaned_df = df[~bad_row_mask.to_numpy()].reset_index(drop=True)
     return cleaned_df
 
 
@@ -49,22 +66,25 @@ def validate_competency_data(df_competency: pd.DataFrame, df_qa: pd.DataFrame):
         errors.append("В матрице компетенций отсутствует колонка 'competency'.")
         matrix_names = pd.Series(dtype=str)
     else:
-        matrix_names = df_competency['competency'].fillna('').astype(str).map(normalize_spaces)
+        matrix_names = normalize_spaces_series(df_competency['competency'])
+
+        # One scan over the column; the (usually empty) hits are then classified
+        forbidden_names = matrix_names[matrix_names.str.contains(_NAME_FORBIDDEN_RE, na=False)]
 
-        comma_mask = matrix_names.str.contains(',', regex=False)
+        comma_mask = forbidden_names.str.contains(',', regex=False, na=False)
         if comma_mask.any():
-            rows = [str(i + 2) for i in matrix_names[comma_mask].index[:5]]
-            offending = matrix_names[comma_mask].unique().tolist()
+            rows = [str(i + 2) for i in forbidden_names[comma_mask].index[:5]]
+            offending = forbidden_names[comma_mask].unique().tolist()
             errors.append(
                 f"Матрица компетенций, строки {', '.join(rows)}: запрещены запятые в названии. Исправьте: "
                 + ", ".join(offending[:5])
                 + (" ..." if len(offending) > 5 else "")
             )
 
-        parentheses_mask = matrix_names.str.contains(r'[()]', regex=True)
+        parentheses_mask = forbidden_names.str.contains(_PAREN_RE, na=False)
         if parentheses_mask.any():
-            rows = [str(i + 2) for i in matrix_names[parentheses_mask].index[:5]]
-            offending = matrix_names[parentheses_mask].unique().tolist()
+            rows = [str(i + 2) for i in forbidden_names[parentheses_mask].index[:5]]
+            offending = forbidden_names[parentheses_mask].unique().tolist()
             errors.append(
                 f"Матрица компетенций, строки {', '.join(rows)}: уберите текст в скобках из 'competency'. Найдены: "
                 + ", ".join(offending[:5])
@@ -82,13 +102,15 @@ def validate_competency_data(df_competency: pd.DataFrame, df_qa: pd.DataFrame):
         errors.append("В таблице ответов отсутствует колонка 'Компетенции'.")
         qa_competencies_series = pd.Series(dtype=str)
     else:
-        qa_competencies_series = df_qa['Компетенции'].fillna('').astype(str).map(normalize_spaces)
+        qa_competencies_series = normalize_spaces_series(df_qa['Компетенции'])
 
-        qa_parentheses_mask = qa_competencies_series.str.contains(r'[()]', regex=True)
+        qa_parentheses_mask = qa_competencies_series.str.contains(_PAREN_RE, na=False)
         if qa_parentheses_mask.any():
             offending_rows = df_qa.loc[qa_parentheses_mask, ['Email', 'Компетенции']]
+            examples = offending_rows.head(5)
             details = "; ".join(
-                f"Email {row.get('Email', 'N/A')}: {row['Компетенции']}" for _, row in offending_rows.head(5).iterrows()
+                f"Email {email}: {competencies}"
+                for email, competencies in zip(examples['Email'], examples['Компетенции'])
             )
             if len(offending_rows) > 5:
                 details += " ..."
@@ -96,14 +118,15 @@ def validate_competency_data(df_competency: pd.DataFrame, df_qa: pd.DataFrame):
                 "Уберите текст в скобках в колонке 'Компетенции' таблицы ответов. Примеры: " + details
             )
 
-    qa_competency_names = set()
-    for value in qa_competencies_series:
-        if not value:
-            continue
-        parts = [part.strip() for part in value.split(',') if part.strip()]
-        qa_competency_names.update(parts)
+    # The merged sheet repeats each task's competencies once per participant;
+    # tokenize each distinct value only once
+    qa_parts = (
+        qa_competencies_series.drop_duplicates()
+        .str.split(',', regex=False).explode().str.strip()
+    )
+    qa_competency_names = set(qa_parts[qa_parts.notna() & (qa_parts != '')].unique())
 
-    matrix_name_set = set(matrix_names[matrix_names != ''])
+    matrix_name_set = set(matrix_names[matrix_names != ''].unique())
 
     missing_in_matrix = sorted(qa_competency_names - matrix_name_set)
     # missing_in_qa = sorted(matrix_name_set - qa_competency_names)
@@ -1,12 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from assessment_client.modules.api_client import send_to_assessment_api
-from assessment_client.modules.config import EVAL_TYPE_KEYS, IPR_REPORT_PARTS
+from assessment_client.modules.api_client import MAX_PARALLEL_REQUESTS, send_to_assessment_api, serialize_payloads
+from assessment_client.modules.config import EVAL_TYPE_KEYS, EXCEL_ENGINE_OPTIONS, IPR_REPORT_PARTS
 from assessment_client.modules.processing import process_all_inputs
 from assessment_client.modules.utils import download_example_button
 import asyncio
 
+# Maximum number of bytes of a payload rendered in the JSON preview
+JSON_PREVIEW_LIMIT = 8192
+EVALUATE_API_URLS = (
+    "https://evolveaiserver-production.up.railway.app/evaluate_assessment",
+    "http://host.docker.internal:8000/evaluate_assessment",
+    "Custom",
+)
+
+
+@st.cache_data
+def load_columns_info(path: str) -> str:
+    # Only the header row is needed
+    df = pd.read_excel(path, nrows=0, **EXCEL_ENGINE_OPTIONS)
+    columns = df.columns.tolist()
+    columns_to_code = list(map(lambda x: f"`{x}`", columns))
+    columns_to_string = ", ".join(columns_to_code)
+    return columns_to_string
+
 
 async def render():
     st.title("Assessment Report")
@@ -16,11 +36,7 @@ async def render():
     st.sidebar.header("Configuration")
     api_url = st.sidebar.selectbox(
         "Assessment API URL",
-        options=[
-            "https://evolveaiserver-production.up.railway.app/evaluate_assessment",
-            "http://host.docker.internal:8000/evaluate_assessment",
-            "Custom"
-        ],
+        options=EVALUATE_API_URLS,
         index=0,
         help="Select the API endpoint URL"
     )
@@ -146,10 +162,26 @@ async def render():
                 show_qualification=show_qualification,
             )
             if results:
-                st.session_state["preview_results"] = results
-                for email, payload in results.items():
+                # Serialize once: the same bytes are previewed and sent to the API
+                serialized = serialize_payloads(results)
+                st.session_state["preview_results"] = serialized
+                for email, body in serialized.items():
                     with st.expander(f"JSON запрос для {email}"):
-                        st.json(payload)
+                        # Expander content is shipped to the browser even when collapsed,
+                        # so only render the payload on demand and cap its size
+                        if st.checkbox("Показать JSON", key=f"show_json_{email}"):
+                            if len(body) > JSON_PREVIEW_LIMIT:
+                                st.caption(f"Показаны первые {JSON_PREVIEW_LIMIT} байт из {len(body)}")
+                                st.code(body[:JSON_PREVIEW_LIMIT].decode(errors="ignore") + "…", language="json")
+                                st.download_button(
+                                    "Скачать полный JSON",
+                                    data=body,
+                                    file_name=f"{email}.json",
+                                    mime="application/json",
+                                    key=f"download_json_{email}",
+                                )
+                            else:
+                                st.json(body.decode(), expanded=False)
             else:
                 st.session_state.pop("preview_results", None)
         except Exception as e:
@@ -168,22 +200,40 @@ async def render():
 
             progress_bar = st.progress(0)
             status_container = st.container()
+            # Each progress update is a frontend message: cap them at ~100 per batch
+            progress_step = max(1, len(results) // 100)
+            statuses = []
 
-            for idx, (email, payload) in enumerate(results.items()):
-                with status_container:
-                    st.write(f"Processing email: {email}")
+            # Requests are I/O-bound: send them concurrently and report as they complete
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as executor:
+                futures = {
+                    executor.submit(send_to_assessment_api, payload, api_url): email
+                    for email, payload in results.items()
+                }
+                for idx, future in enumerate(as_completed(futures)):
+                    email = futures[future]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        response = str(e)
 
-                    response = send_to_assessment_api(payload, api_url)
-
-                    if isinstance(response, str):
-                        st.error(f"Error for {email}: {response}")
-                    else:
-                        if response.status_code == 200:
-                            st.success(f"✅ Successfully sent data for {email}")
+                    # Failures are shown right away, successes are summarised below
+                    with status_container:
+                        if isinstance(response, str):
+                            st.error(f"Error for {email}: {response}")
+                            statuses.append({"Email": email, "Status": "❌ error"})
+                        elif response.status_code == 200:
+                            statuses.append({"Email": email, "Status": "✅ 200"})
                         else:
                             st.warning(f"⚠️ API returned status {response.status_code} for {email}: {response.text}")
+                            statuses.append({"Email": email, "Status": f"⚠️ {response.status_code}"})
+
+                    done = idx + 1
+                    if done % progress_step == 0 or done == len(results):
+                        progress_bar.progress(done / len(results))
 
-                progress_bar.progress((idx + 1) / len(results))
+            with status_container:
+                st.dataframe(statuses, use_container_width=True, hide_index=True)
 
             st.balloons()
             st.success("All emails processed!")
@@ -193,14 +243,6 @@ async def render():
 
     _examples_dir = Path(__file__).resolve().parent.parent / "examples" / examples_subdir
 
-    @st.cache_data
-    def load_columns_info(path: str) -> str:
-        df = pd.read_excel(path)
-        columns = df.columns.tolist()
-        columns_to_code = list(map(lambda x: f"`{x}`", columns))
-        columns_to_string = ", ".join(columns_to_code)
-        return columns_to_string
-
     matrix_columns = load_columns_info(str(_examples_dir / "matrix.xlsx"))
     answers_columns = load_columns_info(str(_examples_dir / "answers.xlsx"))
     st.markdown(f"""
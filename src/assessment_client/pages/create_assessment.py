@@ -8,6 +8,11 @@ import asyncio
 
 
 EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+CREATE_ASSESSMENT_API_URLS = (
+    "https://evolveaiserver-production.up.railway.app/create_assessment",
+    "http://host.docker.internal:8000/create_assessment",
+    "Custom",
+)
 
 
 async def render():
@@ -15,11 +20,7 @@ async def render():
     st.sidebar.header("Configuration")
     api_url = st.sidebar.selectbox(
         "Assessment API URL",
-        options=[
-            "https://evolveaiserver-production.up.railway.app/create_assessment",
-            "http://host.docker.internal:8000/create_assessment",
-            "Custom"
-        ],
+        options=CREATE_ASSESSMENT_API_URLS,
         index=0,
         help="Select the API endpoint URL"
     )
@@ -227,21 +228,18 @@ async def render():
     
     # build CreateAssessmentRequest from form data
     # Nest flat level_* fields into IndicatorLevel for Pydantic validation
-    structured_competencies = []
-    for comp in competencies:
-        structured_indicators = []
-        for ind in comp["indicators"]:
-            structured_indicators.append({
-                "name": ind["name"],
-                "description": ind["description"],
-                "levels": ind["levels"],
-            })
-        structured_competencies.append({
+    structured_competencies = [
+        {
             "competency": comp["name"],
             "competency_description": comp["description"],
             "weight": comp["weight"],
-            "indicators": structured_indicators,
-        })
+            "indicators": [
+                {"name": ind["name"], "description": ind["description"], "levels": ind["levels"]}
+                for ind in comp["indicators"]
+            ],
+        }
+        for comp in competencies
+    ]
 
     # Build request payload (used for preview and sending)
     request_payload = {
@@ -259,14 +257,20 @@ async def render():
     }
 
     with st.expander("JSON запроса для API", expanded=False):
-        st.json(request_payload)
+        # Expander content is sent to the browser even when collapsed, and the
+        # page reruns on every edit: render the JSON only on request
+        if st.checkbox("Показать JSON", key="show_request_json"):
+            st.json(request_payload)
 
     # send request to API endpoint
     if st.button("Отправить запрос на создание ассессмента"):
         try:
             request_data = dm.CreateAssessmentRequest(**request_payload)
             with st.spinner("Отправляем запрос..."):
-                response = send_to_assessment_api(request_data.model_dump(by_alias=True), api_url)
+                # Serialize straight to JSON bytes (no intermediate dict) and
+                # run the blocking POST off the event loop
+                body = request_data.model_dump_json(by_alias=True).encode()
+                response = await asyncio.to_thread(send_to_assessment_api, body, api_url)
                 response.raise_for_status()
                 st.success("Ассессмент успешно создан!")
 
@@ -8,8 +8,14 @@ import assessment_client.modules.config as config
 from assessment_client.modules.data_models import AssessmentGoal, AssessmentFrequency, MatrixRequest
 
 
-ASSESSMENT_FREQUENCIES = [freq.value for freq in AssessmentFrequency]
-ASSESSMENT_GOALS = [goal.value for goal in AssessmentGoal]
+ASSESSMENT_FREQUENCIES = tuple(f.value for f in AssessmentFrequency)
+ASSESSMENT_GOALS = tuple(g.value for g in AssessmentGoal)
+MATRIX_API_URLS = (
+    "https://evolveaiserver-production.up.railway.app/competencies_matrix",
+    "http://host.docker.internal:8000/competencies_matrix",
+    "Custom",
+)
+ASSESSMENT_LENGTH_OPTIONS = (30, 60, 90, 120)
 
 
 def render():
@@ -21,11 +27,7 @@ def render():
     st.sidebar.header("Configuration")
     api_url = st.sidebar.selectbox(
         "Assessment API URL",
-        options=[
-            "https://evolveaiserver-production.up.railway.app/competencies_matrix",
-            "http://host.docker.internal:8000/competencies_matrix",
-            "Custom"
-        ],
+        options=MATRIX_API_URLS,
         index=0,
         help="Select the API endpoint URL"
     )
@@ -74,20 +76,17 @@ def render():
             st.session_state['case_0'] = 'Короткий сценарий: звонок клиенту с отказом'
 
         if st.button("Очистить пример"):
-            keys_to_clear = [
+            keys_to_clear = {
                 'competency_count', 'typical_case_count', 'language', 'target_audience',
                 'assessment_goal', 'frequency', 'company_name', 'audience_description',
-                'company_values_and_tone', 'customer_pain_points'
-            ]
-            for k in keys_to_clear:
-                st.session_state.pop(k, None)
-            # clear competency fields up to 10
-            for i in range(10):
-                st.session_state.pop(f'comp_name_{i}', None)
-                st.session_state.pop(f'comp_weight_{i}', None)
-                st.session_state.pop(f'comp_desc_{i}', None)
-            for i in range(5):
-                st.session_state.pop(f'case_{i}', None)
+                'company_values_and_tone', 'customer_pain_points',
+                # competency fields up to 10
+                *(f'comp_{field}_{i}' for i in range(10) for field in ('name', 'weight', 'desc')),
+                *(f'case_{i}' for i in range(5)),
+            }
+            # Only delete keys that are actually set
+            for k in keys_to_clear & st.session_state.keys():
+                del st.session_state[k]
 
     # Main fields
     col1, col2 = st.columns(2)
@@ -113,7 +112,7 @@ def render():
         company_name = st.text_input("Название компании", placeholder="ООО Пример", key='company_name')
         assessment_length_minutes = st.select_slider(
             "Длительность ассессмента (минуты)",
-            options=[30, 60, 90, 120],
+            options=ASSESSMENT_LENGTH_OPTIONS,
             value=60,            key='assessment_length_minutes'
         )
 
@@ -168,21 +167,20 @@ def render():
     normalized_company_name = None
 
     # Always build payload for preview (even before submit)
-    competencies_payload = []
-    for idx, (name, weight, description) in enumerate(competency_inputs, start=1):
-        normalized_name = normalize_spaces(name)
-        competencies_payload.append({
-            "name": normalized_name,
+    # Each field is normalized once; submit validation reuses these values
+    normalized_competencies = [
+        {
+            "name": normalize_spaces(name),
             "weight": weight,
             "description": normalize_spaces(description) or None
-        })
+        }
+        for name, weight, description in competency_inputs
+    ]
 
-    competencies_payload = [comp for comp in competencies_payload if comp["name"]]
+    competencies_payload = [comp for comp in normalized_competencies if comp["name"]]
 
     typical_cases_payload = [
-        normalize_spaces(case)
-        for case in typical_cases_inputs
-        if normalize_spaces(case)
+        case for case in map(normalize_spaces, typical_cases_inputs) if case
     ]
 
     normalized_target_audience = normalize_spaces(target_audience)
@@ -210,10 +208,10 @@ def render():
 
     # Validate required fields on submit
     errors = []
-    for idx, (name, weight, _description) in enumerate(competency_inputs, start=1):
-        if not normalize_spaces(name):
+    for idx, comp in enumerate(normalized_competencies, start=1):
+        if not comp["name"]:
             errors.append(f"Компетенция #{idx} должна содержать название.")
-        if weight <= 0:
+        if comp["weight"] <= 0:
             errors.append(f"Компетенция #{idx} должна иметь положительный вес.")
 
     if typical_cases_inputs and not typical_cases_payload:
@@ -237,7 +235,7 @@ def render():
         st.error(f"Ошибка валидации запроса: {e}")
         return
 
-    serialized_payload = request_data.model_dump(mode="json", by_alias=True)
+    serialized_payload = request_data.model_dump_json(by_alias=True).encode()
 
     response = send_to_assessment_api(serialized_payload, api_url)
     if isinstance(response, str):
@@ -0,0 +1,68 @@
+import asyncio
+import io
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from src.assessment_client.modules.data_models import EvalAssessmentRequest
+from src.assessment_client.modules.processing import process_all_inputs
+
+EXAMPLES_DIR = os.path.join(ROOT, "src", "assessment_client", "examples", "ipr")
+
+
+class UploadedFile(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile (a named BytesIO)."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def load_example(filename: str) -> UploadedFile:
+    with open(os.path.join(EXAMPLES_DIR, filename), "rb") as f:
+        return UploadedFile(f.read(), filename)
+
+
+def answers_for_emails(emails) -> UploadedFile:
+    """Copy the single-participant example answers once per email."""
+    answers = pd.read_excel(os.path.join(EXAMPLES_DIR, "answers.xlsx"))
+    frames = []
+    for email in emails:
+        one = answers.copy()
+        one["Email"] = email
+        frames.append(one)
+
+    buffer = io.BytesIO()
+    pd.concat(frames, ignore_index=True).to_excel(
+        buffer, sheet_name="Результаты участников", index=False
+    )
+    return UploadedFile(buffer.getvalue(), "answers.xlsx")
+
+
+def test_process_all_inputs_returns_payload_per_email():
+    emails = ["a@example.com", "b@example.com", "c@example.com"]
+
+    results = asyncio.run(
+        process_all_inputs(
+            answers_for_emails(emails),
+            load_example("logic.xlsx"),
+            load_example("matrix.xlsx"),
+        )
+    )
+
+    assert len(results) == 3
+    assert list(results) == emails
+    for email, payload in results.items():
+        assert payload["user_email"] == email
+        assert payload["competency_matrix"]
+        # Keys follow the schema order, with the shared matrix in its usual place
+        assert list(payload) == list(EvalAssessmentRequest.model_fields)
+
+    # The matrix is dumped once and shared by every payload
+    first, second = results["a@example.com"], results["b@example.com"]
+    assert first["competency_matrix"] is second["competency_matrix"]
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import orjson
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.assessment_client.modules.api_client import serialize_payloads
+
+
+def test_shared_matrix_is_spliced_into_every_body():
+    matrix = [{"name": "Коммуникация", "weight": 50.0, "indicators": []}]
+    payloads = {
+        email: {"user_email": email, "competency_matrix": matrix, "assessment_type": "external"}
+        for email in ("a@example.com", "b@example.com")
+    }
+
+    bodies = serialize_payloads(payloads)
+
+    assert list(bodies) == list(payloads)
+    for key, payload in payloads.items():
+        assert orjson.loads(bodies[key]) == payload
+        # The shared value keeps its key position
+        assert bodies[key] == orjson.dumps(payload)
+
+
+def test_shared_key_first_and_last():
+    matrix = [{"name": "Коммуникация"}]
+    payloads = {
+        "first": {"competency_matrix": matrix, "user_email": "a@example.com"},
+        "last": {"user_email": "b@example.com", "competency_matrix": matrix},
+    }
+
+    bodies = serialize_payloads(payloads)
+
+    for key, payload in payloads.items():
+        assert bodies[key] == orjson.dumps(payload)
+
+
+def test_payload_without_shared_key():
+    payloads = {"a@example.com": {"user_email": "a@example.com", "statements": []}}
+
+    bodies = serialize_payloads(payloads)
+
+    assert orjson.loads(bodies["a@example.com"]) == payloads["a@example.com"]
+    assert bodies["a@example.com"] == orjson.dumps(payloads["a@example.com"])
+
+
+def test_payload_with_only_shared_key():
+    payloads = {"a@example.com": {"competency_matrix": [{"name": "Коммуникация"}]}}
+
+    bodies = serialize_payloads(payloads)
+
+    assert orjson.loads(bodies["a@example.com"]) == payloads["a@example.com"]
+    assert bodies["a@example.com"] == orjson.dumps(payloads["a@example.com"])